@@ -1,9 +1,57 @@
 from django import forms
-from django.core.validators import validate_email
+from django.core.validators import EmailValidator
 from django.core.exceptions import ValidationError
-import re
 from .models import ConsultationReport
 
+# Characters stripped from phone numbers before matching
+_PHONE_STRIP = str.maketrans('', '', ' -()')
+_EMAIL_VALIDATOR = EmailValidator()
+
+def _is_valid_phone(number):
+    """Check a phone number already stripped of spaces, dashes and parentheses"""
+    local = not number.startswith('+')
+    digits = number if local else number[1:]
+    if not (digits.isascii() and digits.isdigit()):
+        return False
+    # International style (no leading zero, up to 16 digits) or a 10+ digit local number
+    return (digits[0] != '0' and len(digits) <= 16) or (local and len(digits) >= 10)
+
+def _is_valid_contact(contact):
+    """Check if contact is valid email or phone number"""
+    # Emails always contain '@' and phone numbers never do
+    if '@' in contact:
+        try:
+            _EMAIL_VALIDATOR(contact)
+            return True
+        except ValidationError:
+            return False
+    
+    # Check phone number (simple pattern)
+    return _is_valid_phone(contact.translate(_PHONE_STRIP))
+
+def _check_contact(contact):
+    """Validate a contact field (email or phone)"""
+    if contact and not _is_valid_contact(contact):
+        raise ValidationError('Please enter a valid email address or phone number.')
+
+def _check_text_length(label):
+    """Build a check limiting a free-text field to 5000 characters"""
+    def check(text):
+        if text and len(text) > 5000:
+            raise ValidationError(f'{label} cannot exceed 5000 characters.')
+    return check
+
+_check_chief_complaint = _check_text_length('Chief complaint')
+_check_consultation_note = _check_text_length('Consultation note')
+
+# Checks shared by the form's clean_<field> hooks and validate_field
+_FIELD_CHECKS = {
+    'physician_contact': _check_contact,
+    'patient_contact': _check_contact,
+    'chief_complaint': _check_chief_complaint,
+    'consultation_note': _check_consultation_note,
+}
+
 class ConsultationReportForm(forms.ModelForm):
     """Form for creating consultation reports"""
     
@@ -78,60 +126,57 @@ class ConsultationReportForm(forms.ModelForm):
     def clean_physician_contact(self):
         """Validate physician contact (email or phone)"""
         contact = self.cleaned_data.get('physician_contact')
-        if contact:
-            if not self._is_valid_contact(contact):
-                raise ValidationError('Please enter a valid email address or phone number.')
+        _check_contact(contact)
         return contact
 
     def clean_patient_contact(self):
         """Validate patient contact (email or phone)"""
         contact = self.cleaned_data.get('patient_contact')
-        if contact:
-            if not self._is_valid_contact(contact):
-                raise ValidationError('Please enter a valid email address or phone number.')
+        _check_contact(contact)
         return contact
 
     def clean_clinic_logo(self):
         """Validate uploaded logo file"""
         logo = self.cleaned_data.get('clinic_logo')
-        if logo:
-            # Check file size (max 5MB)
-            if logo.size > 5 * 1024 * 1024:
-                raise ValidationError('File size cannot exceed 5MB.')
-            
-            # Check file type
-            allowed_types = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
-            if hasattr(logo, 'content_type') and logo.content_type not in allowed_types:
-                raise ValidationError('Please upload a valid image file (JPEG, PNG, GIF, or WebP).')
+        if not logo:
+            return logo
+        
+        # Check file size (max 5MB)
+        if logo.size > 5 * 1024 * 1024:
+            raise ValidationError('File size cannot exceed 5MB.')
+        
+        # Check file type; forms.ImageField sets content_type from Pillow's detected format
+        allowed_types = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
+        if hasattr(logo, 'content_type') and logo.content_type not in allowed_types:
+            raise ValidationError('Please upload a valid image file (JPEG, PNG, GIF, or WebP).')
         
         return logo
 
     def clean_chief_complaint(self):
         """Validate chief complaint length"""
         complaint = self.cleaned_data.get('chief_complaint')
-        if complaint and len(complaint) > 5000:
-            raise ValidationError('Chief complaint cannot exceed 5000 characters.')
+        _check_chief_complaint(complaint)
         return complaint
 
     def clean_consultation_note(self):
         """Validate consultation note length"""
         note = self.cleaned_data.get('consultation_note')
-        if note and len(note) > 5000:
-            raise ValidationError('Consultation note cannot exceed 5000 characters.')
+        _check_consultation_note(note)
         return note
 
-    def _is_valid_contact(self, contact):
-        """Check if contact is valid email or phone number"""
-        # Check email
-        try:
-            validate_email(contact)
-            return True
-        except ValidationError:
-            pass
-        
-        # Check phone number (simple pattern)
-        phone_pattern = r'^[\+]?[1-9][\d]{0,15}$|^[\d\s\-\(\)]{10,}$'
-        if re.match(phone_pattern, contact.replace(' ', '').replace('-', '').replace('(', '').replace(')', '')):
-            return True
-        
-        return False
\ No newline at end of file
+
+def validate_field(field_name, value):
+    """Validate a single form field in isolation, returning its error messages"""
+    field = ConsultationReportForm.base_fields.get(field_name)
+    # Uploads cannot be validated from a JSON value
+    if field is None or isinstance(field, forms.FileField):
+        return []
+    
+    try:
+        value = field.clean(value)
+        check = _FIELD_CHECKS.get(field_name)
+        if check is not None:
+            check(value)
+    except ValidationError as e:
+        return e.messages
+    return []
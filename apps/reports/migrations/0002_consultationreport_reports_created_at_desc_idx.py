@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 05:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='consultationreport',
+            index=models.Index(fields=['-created_at'], name='reports_created_at_desc_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MaxLengthValidator
-import os
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 
 def logo_upload_path(instance, filename):
     """Generate upload path for clinic logos"""
@@ -33,6 +34,9 @@ class ConsultationReport(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='reports_created_at_desc_idx'),
+        ]
         verbose_name = 'Consultation Report'
         verbose_name_plural = 'Consultation Reports'
     
@@ -48,10 +52,13 @@ class ConsultationReport(models.Model):
         """Generate PDF filename according to specifications"""
         dob_str = self.patient_dob.strftime('%Y%m%d')
         return f"CR_{self.patient_last_name}_{self.patient_first_name}_{dob_str}.pdf"
-    
-    def delete(self, *args, **kwargs):
-        """Delete logo file when model instance is deleted"""
-        if self.clinic_logo:
-            if os.path.isfile(self.clinic_logo.path):
-                os.remove(self.clinic_logo.path)
-        super().delete(*args, **kwargs)
\ No newline at end of file
+
+
+@receiver(post_delete, sender=ConsultationReport)
+def delete_clinic_logo(sender, instance, **kwargs):
+    """Delete logo file when a report is deleted, including bulk deletes"""
+    if instance.clinic_logo:
+        # Only remove the file once the row deletion is committed
+        storage = instance.clinic_logo.storage
+        name = instance.clinic_logo.name
+        transaction.on_commit(lambda: storage.delete(name))
@@ -0,0 +1,280 @@
+"""
+PDF layout for consultation reports
+
+Kept separate from utils so ReportLab is only imported when a PDF is built.
+"""
+
+import os
+from datetime import datetime
+from xml.sax.saxutils import escape
+from django.conf import settings
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Paragraph, Spacer, CondPageBreak, Table, TableStyle
+from reportlab.lib.colors import HexColor
+from reportlab.lib.enums import TA_CENTER
+from reportlab.platypus.frames import Frame
+from reportlab.platypus.doctemplate import PageTemplate, BaseDocTemplate
+
+from .utils import calculate_age
+
+# Paragraph styles shared by every report
+_STYLES = getSampleStyleSheet()
+
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=26,
+    textColor=HexColor('#1e40af'),
+    alignment=TA_CENTER,
+    spaceAfter=30,
+    spaceBefore=20
+)
+
+_SECTION_STYLE = ParagraphStyle(
+    'SectionHeader',
+    parent=_STYLES['Heading2'],
+    fontSize=16,
+    textColor=HexColor('#1e40af'),
+    spaceBefore=25,
+    spaceAfter=12,
+    borderWidth=0,
+    borderColor=HexColor('#e5e7eb'),
+    leftIndent=0
+)
+
+# Label/value rows are plain table cells, which skip the paragraph parser
+_INFO_INDENT = 20
+_INFO_LABEL_WIDTH = 1.8*inch
+_INFO_FONT = 'Helvetica'
+_INFO_FONT_SIZE = 12
+
+_INFO_TABLE_STYLE = TableStyle([
+    ('FONT', (0, 0), (0, -1), 'Helvetica-Bold', 12, 16),
+    ('FONT', (1, 0), (1, -1), _INFO_FONT, _INFO_FONT_SIZE, 16),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('LEFTPADDING', (0, 0), (0, -1), _INFO_INDENT),
+    ('LEFTPADDING', (1, 0), (1, -1), 0),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+    ('TOPPADDING', (0, 0), (-1, -1), 0),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+])
+
+_BOX_STYLE = ParagraphStyle(
+    'BoxStyle',
+    parent=_STYLES['Normal'],
+    fontSize=11,
+    leftIndent=20,
+    rightIndent=20,
+    spaceAfter=15,
+    spaceBefore=10,
+    borderWidth=1,
+    borderColor=HexColor('#d1d5db'),
+    borderPadding=15,
+    backColor=HexColor('#f9fafb'),
+    leading=18
+)
+
+# Extra entity for xml.sax.saxutils.escape so free text keeps its newlines
+_LINE_BREAK = {'\n': '<br/>'}
+
+_END_STYLE = ParagraphStyle(
+    'EndStyle',
+    parent=_STYLES['Normal'],
+    alignment=TA_CENTER,
+    fontSize=14,
+    textColor=HexColor('#6b7280'),
+    borderWidth=1,
+    borderColor=HexColor('#e5e7eb'),
+    borderPadding=20,
+    backColor=HexColor('#f9fafb')
+)
+
+class ReportDocTemplate(BaseDocTemplate):
+    """Custom document template with headers and footers"""
+    
+    def __init__(self, filename, report_data, timestamp, user_ip, **kwargs):
+        BaseDocTemplate.__init__(self, filename, **kwargs)
+        self.report_data = report_data
+        self.timestamp = timestamp
+        self.user_ip = user_ip
+        
+        # Resolve the logo path once; drawImage embeds it once per document
+        self._logo_path = None
+        if report_data.clinic_logo:
+            logo_path = os.path.join(settings.MEDIA_ROOT, str(report_data.clinic_logo))
+            if os.path.exists(logo_path):
+                self._logo_path = logo_path
+        
+        # Create page template
+        frame = Frame(
+            self.leftMargin, self.bottomMargin,
+            self.width, self.height - 100,
+            id='normal'
+        )
+        
+        template = PageTemplate(id='main', frames=[frame], onPage=self.add_page_decorations)
+        self.addPageTemplates([template])
+    
+    def add_page_decorations(self, canvas, doc):
+        """Add header and footer to each page"""
+        canvas.saveState()
+        
+        # Header
+        header_y = A4[1] - 50
+        
+        # Logo
+        if self._logo_path is not None:
+            try:
+                canvas.drawImage(
+                    self._logo_path, 
+                    72, header_y - 60, 
+                    width=120, height=60,
+                    preserveAspectRatio=True,
+                    mask='auto'
+                )
+            except Exception as e:
+                print(f"Error adding logo: {e}")
+        
+        # Clinic name
+        canvas.setFont("Helvetica-Bold", 18)
+        canvas.setFillColor(HexColor('#1e40af'))
+        canvas.drawCentredString(A4[0]/2, header_y - 30, self.report_data.clinic_name)
+        
+        # Header line
+        canvas.setStrokeColor(HexColor('#1e40af'))
+        canvas.setLineWidth(2)
+        canvas.line(72, header_y - 80, A4[0] - 72, header_y - 80)
+        
+        # Footer
+        footer_text = f"This report is generated on {self.timestamp} from {self.user_ip}"
+        canvas.setFont("Helvetica", 9)
+        canvas.setFillColor(HexColor('#666666'))
+        canvas.drawCentredString(A4[0]/2, 50, footer_text)
+        
+        # Page number
+        page_num = canvas.getPageNumber()
+        canvas.drawCentredString(A4[0]/2, 35, f"Page {page_num}")
+        
+        # Footer line
+        canvas.setStrokeColor(HexColor('#cccccc'))
+        canvas.setLineWidth(1)
+        canvas.line(72, 65, A4[0] - 72, 65)
+        
+        canvas.restoreState()
+
+def _wrap_value(value, width):
+    """Pre-break a value to the column width; plain table cells never wrap"""
+    lines = []
+    for line in simpleSplit(str(value), _INFO_FONT, _INFO_FONT_SIZE, width):
+        if stringWidth(line, _INFO_FONT, _INFO_FONT_SIZE) <= width:
+            lines.append(line)
+            continue
+        # simpleSplit keeps unbroken words (e.g. long emails) whole, so split those by character
+        chunk = ''
+        for char in line:
+            if chunk and stringWidth(chunk + char, _INFO_FONT, _INFO_FONT_SIZE) > width:
+                lines.append(chunk)
+                chunk = char
+            else:
+                chunk += char
+        lines.append(chunk)
+    return '\n'.join(lines)
+
+def _info_table(rows, width):
+    """Lay out label/value rows for an information section"""
+    label_width = _INFO_INDENT + _INFO_LABEL_WIDTH
+    value_width = width - label_width
+    rows = [(label, _wrap_value(value, value_width)) for label, value in rows]
+    table = Table(rows, colWidths=[label_width, value_width], hAlign='LEFT')
+    table.setStyle(_INFO_TABLE_STYLE)
+    return table
+
+def _text_box(text):
+    """Render free text in a bordered box, keeping its line breaks"""
+    # Escape user markup so "<" or "&" cannot break the paragraph parser, then keep newlines
+    return Paragraph(escape(text, _LINE_BREAK), _BOX_STYLE)
+
+def build_pdf_report(output, report_data, timestamp, user_ip):
+    """Write the consultation report PDF into a file-like object"""
+    
+    # Create document with custom template
+    doc = ReportDocTemplate(
+        output,
+        report_data=report_data,
+        timestamp=timestamp,
+        user_ip=user_ip,
+        pagesize=A4,
+        rightMargin=72,
+        leftMargin=72,
+        topMargin=130,
+        bottomMargin=100
+    )
+    
+    # Build content
+    story = []
+    
+    # Title
+    story.append(Paragraph("CONSULTATION REPORT", _TITLE_STYLE))
+    story.append(Spacer(1, 20))
+    
+    # Clinic Information
+    story.append(Paragraph("Clinic Information", _SECTION_STYLE))
+    story.append(Spacer(1, 5))
+    story.append(_info_table([
+        ("Clinic Name:", report_data.clinic_name),
+        ("Report Generated:", timestamp),
+    ], doc.width))
+    story.append(Spacer(1, 20))
+    
+    # Physician Information
+    story.append(Paragraph("Physician Information", _SECTION_STYLE))
+    story.append(Spacer(1, 5))
+    story.append(_info_table([
+        ("Physician Name:", report_data.physician_name),
+        ("Physician Contact:", report_data.physician_contact),
+    ], doc.width))
+    story.append(Spacer(1, 20))
+    
+    # Patient Information
+    story.append(Paragraph("Patient Information", _SECTION_STYLE))
+    story.append(Spacer(1, 5))
+    
+    # Format date of birth
+    dob = report_data.patient_dob
+    dob_formatted = dob.strftime('%B %d, %Y')
+    patient_age = calculate_age(dob, datetime.now().date())
+    
+    story.append(_info_table([
+        ("Patient Name:", report_data.patient_full_name),
+        ("Date of Birth:", dob_formatted),
+        ("Age:", f"{patient_age} years"),
+        ("Patient Contact:", report_data.patient_contact),
+    ], doc.width))
+    story.append(Spacer(1, 30))
+    
+    # Chief Complaint
+    story.append(Paragraph("Chief Complaint", _SECTION_STYLE))
+    story.append(_text_box(report_data.chief_complaint))
+    story.append(Spacer(1, 20))
+    
+    # Only start a new page when the consultation note would not fit
+    story.append(CondPageBreak(4*inch))
+    
+    # Consultation Note
+    story.append(Paragraph("Consultation Note", _SECTION_STYLE))
+    story.append(_text_box(report_data.consultation_note))
+    story.append(Spacer(1, 50))
+    
+    # End of report
+    story.append(Paragraph(
+        "<b>--- End of Consultation Report ---</b><br/><br/>"
+        "<i>This document was electronically generated and is valid without signature.</i>", 
+        _END_STYLE
+    ))
+    
+    # Build PDF
+    doc.build(story)
@@ -1,3 +1,147 @@
-from django.test import TestCase
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import date
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from .forms import _is_valid_contact, _is_valid_phone
+from .models import ConsultationReport
+
+
+def make_png(name='logo.png'):
+    """Build a small in-memory PNG upload"""
+    buffer = io.BytesIO()
+    Image.new('RGB', (4, 4)).save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+class ContactValidationTests(SimpleTestCase):
+    """Tests for the email/phone contact checks"""
+
+    def test_valid_phone_numbers(self):
+        for number in ['5', '+14155550123', '4155550123', '0123456789', '1234567890123456']:
+            with self.subTest(number=number):
+                self.assertTrue(_is_valid_phone(number))
+
+    def test_invalid_phone_numbers(self):
+        for number in ['', '+', '0', '012345678', '+0123456789', '+12345678901234567',
+                       '١٢٣٤٥٦٧٨٩٠', '²', '123+456', '12a45']:
+            with self.subTest(number=number):
+                self.assertFalse(_is_valid_phone(number))
+
+    def test_seventeen_digits(self):
+        # Too long for the international form, but accepted as a 10+ digit local number
+        self.assertTrue(_is_valid_phone('12345678901234567'))
+        self.assertFalse(_is_valid_phone('+12345678901234567'))
+
+    def test_long_local_number_with_leading_zero(self):
+        self.assertTrue(_is_valid_phone('0' * 20))
+
+    def test_contact_strips_phone_punctuation(self):
+        self.assertTrue(_is_valid_contact('+1 (415) 555-0123'))
+        self.assertTrue(_is_valid_contact('(012) 345-6789'))
+
+    def test_contact_routes_at_sign_to_email(self):
+        self.assertTrue(_is_valid_contact('doctor@example.com'))
+        self.assertFalse(_is_valid_contact('doctor@'))
+        self.assertFalse(_is_valid_contact('4155550123@'))
+
+    def test_contact_rejects_other_text(self):
+        self.assertFalse(_is_valid_contact('call me'))
+        self.assertFalse(_is_valid_contact('+'))
+
+
+class ValidateFormAjaxTests(SimpleTestCase):
+    """Tests for the single-field AJAX validation endpoint"""
+
+    def validate(self, field, value):
+        response = self.client.post(
+            reverse('reports:validate_ajax'),
+            json.dumps({'field': field, 'value': value}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_valid_contact(self):
+        self.assertEqual(self.validate('patient_contact', '4155550123'), {'valid': True, 'errors': []})
+
+    def test_invalid_contact(self):
+        result = self.validate('physician_contact', 'nope')
+        self.assertFalse(result['valid'])
+        self.assertEqual(result['errors'], ['Please enter a valid email address or phone number.'])
+
+    def test_required_field(self):
+        result = self.validate('clinic_name', '')
+        self.assertFalse(result['valid'])
+        self.assertEqual(result['errors'], ['This field is required.'])
+
+    def test_invalid_date(self):
+        self.assertFalse(self.validate('patient_dob', 'not a date')['valid'])
+
+    def test_text_length(self):
+        result = self.validate('chief_complaint', 'x' * 5001)
+        self.assertEqual(result['errors'], ['Chief complaint cannot exceed 5000 characters.'])
+        self.assertTrue(self.validate('consultation_note', 'x' * 5000)['valid'])
+
+    def test_file_field_is_skipped(self):
+        self.assertEqual(self.validate('clinic_logo', 'logo.png'), {'valid': True, 'errors': []})
+
+    def test_unknown_field(self):
+        self.assertTrue(self.validate('unknown', 'value')['valid'])
+
+    def test_malformed_body(self):
+        response = self.client.post(reverse('reports:validate_ajax'), 'not json', content_type='application/json')
+        self.assertEqual(response.json(), {'valid': False, 'errors': ['Validation error occurred']})
+
+
+class LogoCleanupTests(TestCase):
+    """Tests for removing logo files when reports are deleted"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def create_report(self):
+        return ConsultationReport.objects.create(
+            clinic_name='Clinic',
+            clinic_logo=make_png(),
+            physician_name='Dr. Smith',
+            physician_contact='smith@example.com',
+            patient_first_name='Jane',
+            patient_last_name='Doe',
+            patient_dob=date(1990, 5, 17),
+            patient_contact='4155550123',
+            chief_complaint='Headache',
+            consultation_note='Rest'
+        )
+
+    def test_queryset_delete_removes_logo(self):
+        paths = [self.create_report().clinic_logo.path for _ in range(2)]
+        for path in paths:
+            self.assertTrue(os.path.exists(path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ConsultationReport.objects.all().delete()
+
+        for path in paths:
+            self.assertFalse(os.path.exists(path))
+
+    def test_logo_kept_until_commit(self):
+        report = self.create_report()
+        path = report.clinic_logo.path
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            report.delete()
+
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(len(callbacks), 1)
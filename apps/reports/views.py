@@ -7,7 +7,7 @@ from django.utils.decorators import method_decorator
 from django.views import View
 import json
 
-from .forms import ConsultationReportForm
+from .forms import ConsultationReportForm, validate_field
 from .models import ConsultationReport
 from .utils import generate_pdf_report
 
@@ -55,13 +55,8 @@ def validate_form_ajax(request):
         field_name = data.get('field')
         field_value = data.get('value')
         
-        # Create a temporary form instance with the field data
-        form_data = {field_name: field_value}
-        form = ConsultationReportForm(form_data)
-        
-        # Validate specific field
-        form.is_valid()
-        field_errors = form.errors.get(field_name, [])
+        # Validate only the requested field instead of the whole form
+        field_errors = validate_field(field_name, field_value)
         
         return JsonResponse({
             'valid': len(field_errors) == 0,
@@ -139,6 +139,12 @@ STATICFILES_DIRS = [
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+# Resolve the server's public IP via ipify for the PDF footer instead of
+# using the request-provided client IP. Refreshed hourly in a background
+# thread started by the first request that needs it.
+REPORTS_PUBLIC_IP_LOOKUP = False
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 